@@ -0,0 +1,21 @@
+import sys
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class CustomBuildHook(BuildHookInterface):
+    """Generate the precompiled FFI module before building the wheel."""
+
+    def initialize(self, version, build_data):
+        # the header relies on windows types (BOOL, LONG, ...) that cffi only
+        # defines on windows; elsewhere pylucam falls back to parsing at import
+        if self.target_name != "wheel" or sys.platform != "win32":
+            return
+
+        path = Path(self.root) / "src" / "pylucam" / "build_ffi.py"
+        spec = spec_from_file_location("build_ffi", path)
+        build_ffi = module_from_spec(spec)
+        spec.loader.exec_module(build_ffi)
+        build_ffi.build()
@@ -1,8 +1,9 @@
 from cffi import FFI
-from pathlib import Path
 from enum import IntEnum
 from typing import Union, TYPE_CHECKING
 
+from .build_ffi import header_source
+
 if TYPE_CHECKING:
     from .camera import LucamCamera
 
@@ -10,33 +11,24 @@ __all__ = ["LUCAM_API", "LUCAM_LIB", "LUCAM_FFI", "LucamError"]
 
 
 class API:
-    ffi = FFI()
-
     def __init__(self):
+        self.ffi = self.load_ffi()
         self.lib = self.ffi.dlopen("lucamapi.dll")
-        self.load_header()
 
-    def load_header(self) -> None:
+    @staticmethod
+    def load_ffi() -> FFI:
         """
-        Parse the modified header file.
+        Load the FFI generated at build time by `build_ffi.py`.
 
-        The API normally has nultiple header files which are loaded dynamically. CFFI
-        doesn't support the dynamic options, so the files were combined and trimmed.
+        If it wasn't generated (e.g. running from a source checkout), the header is
+        parsed instead, which is noticeably slower.
         """
-        header_path = Path(__file__).parent.parent / "lucamapi.h"
-        with open(header_path, "r") as f:
-            lines = f.readlines()
-            for i, line in enumerate(lines):
-                if "Function Definitions" in line:
-                    function_start = i
-
-            string = "\n".join(lines[:function_start])
-            self.ffi.cdef(string)
-
-            for line in lines[function_start:]:
-                if "LUCAM_API" in line:
-                    line = line[10:].replace("LUCAM_EXPORT", "__stdcall")
-                self.ffi.cdef(line)
+        try:
+            from ._lucam_cffi import ffi
+        except ImportError:
+            ffi = FFI()
+            ffi.cdef(header_source())
+        return ffi
 
 
 LUCAM_API = API()
@@ -313,7 +305,24 @@ class LucamError(Exception):
             self.value = arg.get_last_error()
 
     def __str__(self):
-        return self.CODES[self.value]
+        if 0 <= self.value < len(_ERROR_MESSAGES):
+            return _ERROR_MESSAGES[self.value]
+        return _error_message(self.value)
+
+
+def _error_message(value: int) -> str:
+    """Format the description of an error code as a single line."""
+    description = LucamError.CODES.get(value)
+    if description is None:
+        return f"Unknown Lucam error code {value}."
+    name, _, details = description.partition("\n")
+    return f"{name}: {' '.join(details.split())}"
+
+
+# error codes are dense, so index the messages by code rather than hashing
+_ERROR_MESSAGES = tuple(
+    _error_message(value) for value in range(max(LucamError.CODES) + 1)
+)
 
 
 class LucamErrorCode(IntEnum):
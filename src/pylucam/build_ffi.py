@@ -0,0 +1,48 @@
+"""
+Generate `_lucam_cffi.py`, an out-of-line ABI mode FFI for the Lucam API.
+
+Parsing the header with `cdef` is slow, so it is done once when the package is
+built instead of on every import. Run `python build_ffi.py` to regenerate it by
+hand.
+"""
+
+from pathlib import Path
+
+from cffi import FFI
+
+HEADER_PATH = Path(__file__).parent.parent / "lucamapi.h"
+MODULE_PATH = Path(__file__).parent / "_lucam_cffi.py"
+
+
+def header_source(header_path: Path = HEADER_PATH) -> str:
+    """
+    Return the cdef source for the modified header file.
+
+    The API normally has nultiple header files which are loaded dynamically. CFFI
+    doesn't support the dynamic options, so the files were combined and trimmed.
+    """
+    with open(header_path, "r") as f:
+        lines = f.readlines()
+
+    for i, line in enumerate(lines):
+        if "Function Definitions" in line:
+            function_start = i
+
+    declarations = ["".join(lines[:function_start])]
+    for line in lines[function_start:]:
+        if "LUCAM_API" in line:
+            line = line[10:].replace("LUCAM_EXPORT", "__stdcall")
+        declarations.append(line)
+
+    return "\n".join(declarations)
+
+
+def build(module_path: Path = MODULE_PATH) -> None:
+    ffi = FFI()
+    ffi.cdef(header_source())
+    ffi.set_source("pylucam._lucam_cffi", None)
+    ffi.emit_python_code(str(module_path))
+
+
+if __name__ == "__main__":
+    build()
@@ -2,17 +2,36 @@ import re
 from enum import IntEnum
 from dataclasses import dataclass
 from logging import warning
+from operator import attrgetter
+from queue import Queue
+from struct import Struct, error as StructError
+from threading import Event, Thread
 
 import numpy as np
 from cv2 import (
     cvtColor,
+    cuda,
+    cuda_GpuMat,
+    cuda_Stream,
+    CV_8UC1,
+    CV_8UC3,
     COLOR_BAYER_RGGB2RGB,
     COLOR_BAYER_GRBG2RGB,
     COLOR_BAYER_GBRG2RGB,
     COLOR_BAYER_BGGR2RGB,
+    COLOR_BAYER_RGGB2GRAY,
+    COLOR_BAYER_GRBG2GRAY,
+    COLOR_BAYER_GBRG2GRAY,
+    COLOR_BAYER_BGGR2GRAY,
 )
 
 from .api import LUCAM_FFI, LUCAM_LIB, LucamError, LucamErrorCode
+from .demosaic import (
+    apply_bayer_gains,
+    bayer_gain_luts,
+    demosaic_bilinear,
+    make_demosaic,
+)
 
 __all__ = ["LucamCamera", "LucamProperty"]
 
@@ -35,7 +54,72 @@ class ColorFormat(IntEnum):
     BGGR = LUCAM_LIB.LUCAM_CF_BAYER_BGGR
 
 
-@dataclass
+# bound once so the wrappers on the capture and property paths skip the attribute
+# lookups on the library
+_LucamGetProperty = LUCAM_LIB.LucamGetProperty
+_LucamSetProperty = LUCAM_LIB.LucamSetProperty
+_LucamGetFormat = LUCAM_LIB.LucamGetFormat
+_LucamEnableFastFrames = LUCAM_LIB.LucamEnableFastFrames
+_LucamDisableFastFrames = LUCAM_LIB.LucamDisableFastFrames
+_LucamTakeFastFrame = LUCAM_LIB.LucamTakeFastFrame
+
+
+def _property_name(property: str) -> str:
+    """Convert a camelCase or snake_case property name to its `LUCAM_PROP_` suffix."""
+    if "_" not in property:
+        property = "_".join(re.sub(r"([A-Z])", r" \1", property).split())
+    return property.upper()
+
+
+def _property_ids() -> dict[str, int]:
+    """Map the common spellings of each property (GAIN_RED, gainRed, ...) to its id."""
+    ids = {}
+    for name in dir(LUCAM_LIB):
+        if name.startswith("LUCAM_PROP_"):
+            suffix = name.removeprefix("LUCAM_PROP_")
+            first, *rest = suffix.lower().split("_")
+            camel = first + "".join(part.capitalize() for part in rest)
+            for key in (suffix, suffix.lower(), camel):
+                ids[key] = getattr(LUCAM_LIB, name)
+    return ids
+
+
+_PROPERTY_IDS = _property_ids()
+
+
+# (row, column) shift of each Bayer pattern relative to RGGB
+BAYER_OFFSETS = {
+    ColorFormat.MONO: None,
+    ColorFormat.RGGB: (0, 0),
+    ColorFormat.GRBG: (0, 1),
+    ColorFormat.GBRG: (1, 0),
+    ColorFormat.BGGR: (1, 1),
+}
+
+
+# LUCAM_FRAME_FORMAT as one struct, subSampleX/binningX and subSampleY/binningY are
+# unions so each pair is a single H
+_FORMAT_STRUCT = Struct("=5I4H")
+# LUCAM_SNAPSHOT from exposure through format, skipping the strobe and trigger
+# members. They're packed as two runs around those members so they aren't zeroed.
+_SNAPSHOT_TAIL_OFFSET = LUCAM_FFI.offsetof("LUCAM_SNAPSHOT", "timeout")
+_SNAPSHOT_GAINS_STRUCT = Struct("=6f")
+_SNAPSHOT_TAIL_STRUCT = Struct("=f" + _FORMAT_STRUCT.format[1:])
+_SNAPSHOT_STRUCT = Struct(
+    f"=6f{_SNAPSHOT_TAIL_OFFSET - _SNAPSHOT_GAINS_STRUCT.size}x"
+    + _SNAPSHOT_TAIL_STRUCT.format[1:]
+)
+assert _FORMAT_STRUCT.size == LUCAM_FFI.sizeof("LUCAM_FRAME_FORMAT")
+assert _SNAPSHOT_TAIL_OFFSET + 4 == LUCAM_FFI.offsetof("LUCAM_SNAPSHOT", "format")
+
+
+def _set_fields(cdata, source, attrs: tuple[str, ...]) -> None:
+    """Copy `attrs` field by field, so cffi raises its usual errors for bad values."""
+    for attr in attrs:
+        setattr(cdata, attr, getattr(source, attr))
+
+
+@dataclass(slots=True)
 class Format:
     xOffset: int
     yOffset: int
@@ -51,23 +135,41 @@ class Format:
 
     @classmethod
     def from_lucam(cls, lucam_frame_format):
-        kwargs = {}
-        for attr in cls.__annotations__:
-            kwargs[attr] = getattr(lucam_frame_format, attr)
-
-        return cls(**kwargs)
-
-    def as_lucam(self):
-        """Create and populate a LUCAM_FRAME_FORMAT from self"""
-        lucam_frame_format = LUCAM_FFI.new("LUCAM_FRAME_FORMAT *")
+        # union members appear once in the struct
+        x, y, w, h, pf, sx, fx, sy, fy = _FORMAT_STRUCT.unpack(
+            LUCAM_FFI.buffer(lucam_frame_format)
+        )
+        return cls(x, y, w, h, pf, sx, sx, fx, sy, sy, fy)
+
+    def as_lucam(self, lucam_frame_format=None):
+        """Populate a LUCAM_FRAME_FORMAT from self, creating one if not provided"""
+        if lucam_frame_format is None:
+            lucam_frame_format = LUCAM_FFI.new("LUCAM_FRAME_FORMAT *")
+        try:
+            _FORMAT_STRUCT.pack_into(
+                LUCAM_FFI.buffer(lucam_frame_format), 0, *self._STRUCT_VALUES(self)
+            )
+        except StructError:
+            _set_fields(lucam_frame_format, self, self._ATTRS)
+        return lucam_frame_format
 
-        for attr in self.__annotations__:
-            setattr(lucam_frame_format, attr, getattr(self, attr))
 
-        return lucam_frame_format
+Format._ATTRS = tuple(Format.__annotations__)
+# binningX/Y are set after subSampleX/Y in _ATTRS, so they're the ones packed
+Format._STRUCT_VALUES = attrgetter(
+    "xOffset",
+    "yOffset",
+    "width",
+    "height",
+    "pixelFormat",
+    "binningX",
+    "flagsX",
+    "binningY",
+    "flagsY",
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class Snapshot:
     exposure: float
     gain: float
@@ -80,33 +182,60 @@ class Snapshot:
 
     @classmethod
     def from_lucam(cls, lucam_snapshot):
-        kwargs = {}
-        for attr in cls.__annotations__:
-            value = getattr(lucam_snapshot, attr)
-            if attr == "format":
-                value = Format.from_lucam(value)
-            kwargs[attr] = value
-        return cls(**kwargs)
-
-    def as_lucam(self):
-        """Create and populate a LUCAM_SNAPSHOT from self"""
-        lucam_snapshot = LUCAM_FFI.new("LUCAM_SNAPSHOT *")
-        for attr in self.__annotations__:
-            value = getattr(self, attr)
-            if attr == "format":
-                value: Format
-                value = value.as_lucam()[0]
-            setattr(lucam_snapshot, attr, value)
-
+        e, g, gr, gb, g1, g2, t, x, y, w, h, pf, sx, fx, sy, fy = (
+            _SNAPSHOT_STRUCT.unpack_from(LUCAM_FFI.buffer(lucam_snapshot))
+        )
+        return cls(
+            e, g, gr, gb, g1, g2, t, Format(x, y, w, h, pf, sx, sx, fx, sy, sy, fy)
+        )
+
+    def as_lucam(self, lucam_snapshot=None):
+        """Populate a LUCAM_SNAPSHOT from self, creating one if not provided"""
+        if lucam_snapshot is None:
+            lucam_snapshot = LUCAM_FFI.new("LUCAM_SNAPSHOT *")
+        buffer = LUCAM_FFI.buffer(lucam_snapshot)
+        try:
+            _SNAPSHOT_GAINS_STRUCT.pack_into(buffer, 0, *self._GAINS(self))
+            _SNAPSHOT_TAIL_STRUCT.pack_into(
+                buffer,
+                _SNAPSHOT_TAIL_OFFSET,
+                self.timeout,
+                *Format._STRUCT_VALUES(self.format),
+            )
+        except StructError:
+            _set_fields(lucam_snapshot, self, self._ATTRS)
+            _set_fields(lucam_snapshot.format, self.format, Format._ATTRS)
         return lucam_snapshot
 
 
+# `format` is converted separately since it's a nested struct
+Snapshot._ATTRS = tuple(attr for attr in Snapshot.__annotations__ if attr != "format")
+Snapshot._GAINS = attrgetter(*Snapshot._ATTRS[:6])
+
+
+# property backing each Snapshot field, `timeout` and `format` aren't properties
+_SNAPSHOT_PROPERTIES = {
+    "exposure": LUCAM_LIB.LUCAM_PROP_EXPOSURE,
+    "gain": LUCAM_LIB.LUCAM_PROP_GAIN,
+    "gainRed": LUCAM_LIB.LUCAM_PROP_GAIN_RED,
+    "gainBlue": LUCAM_LIB.LUCAM_PROP_GAIN_BLUE,
+    "gainGrn1": LUCAM_LIB.LUCAM_PROP_GAIN_GREEN1,
+    "gainGrn2": LUCAM_LIB.LUCAM_PROP_GAIN_GREEN2,
+}
+
+
 class LucamCamera:
     format: Format
     snapshot: Snapshot
 
     framerate: float = 30
     fast_frames_enabled: bool = False
+    _frame_buf: np.ndarray | None = None
+    _frame_cdata = None
+    _rgb_buf: np.ndarray | None = None
+    _planar_rgb_buf: np.ndarray | None = None
+    _gained_buf: np.ndarray | None = None
+    _cuda_stream: cuda_Stream | None = None
 
     lib = LUCAM_LIB
     ffi = LUCAM_FFI
@@ -116,17 +245,40 @@ class LucamCamera:
         if self._handle == self.ffi.NULL:
             raise ConnectionError(f"Lucam camera number {number} failed to open.")
 
-        self.get_format()
+        # reused by the wrappers below instead of allocating on every call
+        self._scratch_value = self.ffi.new("FLOAT *")
+        self._scratch_flags = self.ffi.new("LONG *")
+        self._scratch_format = self.ffi.new("LUCAM_FRAME_FORMAT *")
+        self._scratch_framerate = self.ffi.new("FLOAT *")
+        self._scratch_snapshot = self.ffi.new("LUCAM_SNAPSHOT *")
+
+        # also reads the format
         self.get_default_snapshot()
 
-        color_format = self.get_property(LucamProperty.color_format)
+        self.color_format = ColorFormat(self.get_property(LucamProperty.color_format))
+        self.bayer_offset = BAYER_OFFSETS[self.color_format]
+        self.gray_conversion_code = {
+            ColorFormat.MONO: None,
+            ColorFormat.RGGB: COLOR_BAYER_RGGB2GRAY,
+            ColorFormat.GRBG: COLOR_BAYER_GRBG2GRAY,
+            ColorFormat.GBRG: COLOR_BAYER_GBRG2GRAY,
+            ColorFormat.BGGR: COLOR_BAYER_BGGR2GRAY,
+        }[self.color_format]
         self.color_conversion_code = {
             ColorFormat.MONO: None,
             ColorFormat.RGGB: COLOR_BAYER_RGGB2RGB,
             ColorFormat.GRBG: COLOR_BAYER_GRBG2RGB,
             ColorFormat.GBRG: COLOR_BAYER_GBRG2RGB,
             ColorFormat.BGGR: COLOR_BAYER_BGGR2RGB,
-        }[color_format]
+        }[self.color_format]
+
+        # load the Numba kernels for this frame shape now rather than on the first
+        # planar or balanced frame. They're cached on disk, so they're only compiled
+        # once per format.
+        if self.bayer_offset is not None:
+            frame = np.zeros((self.height, self.width), np.uint8)
+            self.convert_frame_to_planar_rgb(frame)
+            self.convert_frame_to_rgb_balanced(frame)
 
     def __del__(self):
         self.lib.LucamCameraClose(self._handle)
@@ -141,35 +293,35 @@ class LucamCamera:
         If a string is provided, it must match the name of a property following
         `LUCAM_PROP_` but isn't case sensitive.
         """
-        if isinstance(property, str):
-            if "_" not in property:
-                property = "_".join(re.sub(r"([A-Z])", r" \1", property).split())
-            property = getattr(self.lib, f"LUCAM_PROP_{property.upper()}")
-        assert isinstance(property, int)
+        if isinstance(property, int):
+            return property
 
-        return property
+        try:
+            return _PROPERTY_IDS[property]
+        except KeyError:
+            value = getattr(self.lib, f"LUCAM_PROP_{_property_name(property)}")
+            _PROPERTY_IDS[property] = value
+            return value
 
     def get_property(self, property: LucamProperty | int | str) -> float:
-        value = self.ffi.new("FLOAT *")
-        flags = self.ffi.new("LONG *")
-
-        if not self.lib.LucamGetProperty(
-            self._handle, self._property_value(property), value, flags
+        value = self._scratch_value
+        if not _LucamGetProperty(
+            self._handle, self._property_value(property), value, self._scratch_flags
         ):
             raise LucamError(self)
         return value[0]
 
     def set_property(self, property: LucamProperty | int | str, value: float) -> None:
-        if not self.lib.LucamSetProperty(
+        if not _LucamSetProperty(
             self._handle, self._property_value(property), value, 0x0
         ):
             raise LucamError(self)
 
     def get_format(self) -> Format:
-        lucam_format = self.ffi.new("LUCAM_FRAME_FORMAT *")
-        framerate = self.ffi.new("FLOAT *")
+        lucam_format = self._scratch_format
+        framerate = self._scratch_framerate
 
-        if not self.lib.LucamGetFormat(self._handle, lucam_format, framerate):
+        if not _LucamGetFormat(self._handle, lucam_format, framerate):
             raise LucamError(self)
 
         format = Format.from_lucam(lucam_format)
@@ -180,54 +332,337 @@ class LucamCamera:
         return format
 
     def get_default_snapshot(self) -> Snapshot:
-        kwargs = {}
-        for property in Snapshot.__annotations__:
-            if property == "format":
-                value = self.get_format()
-            elif property == "timeout":
-                value = 150
-            elif "Grn" in property:
-                value = self.get_property(property.replace("Grn", "Green"))
-            else:
-                value = self.get_property(property)
+        """
+        Build a snapshot from the camera's current properties and format.
 
-            kwargs[property] = value
-        self.snapshot = Snapshot(**kwargs)
+        The API has no batched property query and the wrappers share their scratch
+        buffers, so the properties are read one after another.
+        """
+        kwargs = {
+            field: self.get_property(property)
+            for field, property in _SNAPSHOT_PROPERTIES.items()
+        }
+        self.snapshot = Snapshot(**kwargs, timeout=150, format=self.get_format())
         return self.snapshot
 
     def enable_fast_frames(self, snapshot: Snapshot = None) -> None:
         snapshot = self.snapshot if snapshot is None else snapshot
-        if not self.lib.LucamEnableFastFrames(self._handle, snapshot.as_lucam()):
+        lucam_snapshot = snapshot.as_lucam(self._scratch_snapshot)
+        if not _LucamEnableFastFrames(self._handle, lucam_snapshot):
             raise LucamError(self)
         self.fast_frames_enabled = True
 
     def disable_fast_frames(self) -> None:
-        if not self.lib.LucamDisableFastFrames(self._handle):
+        if not _LucamDisableFastFrames(self._handle):
             raise LucamError(self)
         self.fast_frames_enabled = False
+        self._frame_buf = self._frame_cdata = None
 
     def reset_fast_frames(self) -> None:
         """Disable and re-enable fast frames to reset the active snapshot."""
         self.disable_fast_frames()
         self.enable_fast_frames()
 
-    def take_fast_frame(self) -> np.ndarray:
-        frame = np.ndarray((self.height, self.width), dtype=np.uint8)
-        frame = np.ascontiguousarray(frame)
-        if not self.lib.LucamTakeFastFrame(self._handle, self.ffi.from_buffer(frame)):
+    def _fast_frame_buffer(self) -> tuple:
+        """
+        Return the capture buffer reused across fast frames and its cdata pointer.
+
+        The buffer is (re)allocated whenever the frame shape changes. The pointer is
+        kept with it so it isn't rebuilt with `from_buffer` on every frame.
+        """
+        shape = (self.height, self.width)
+        if self._frame_buf is None or self._frame_buf.shape != shape:
+            self._frame_buf = np.empty(shape, dtype=np.uint8)
+            self._frame_cdata = self.ffi.from_buffer(self._frame_buf)
+        return self._frame_buf, self._frame_cdata
+
+    def take_fast_frame(self, copy: bool = True) -> np.ndarray:
+        """
+        Capture a raw frame.
+
+        By default the frame is captured into a new array. With `copy=False` and fast
+        frames enabled, it's written into a buffer reused by every call instead, which
+        skips the per-frame allocation but is overwritten by the next capture.
+        """
+        if copy or not self.fast_frames_enabled:
+            frame = np.empty((self.height, self.width), dtype=np.uint8)
+            frame_cdata = self.ffi.from_buffer(frame)
+        else:
+            frame, frame_cdata = self._fast_frame_buffer()
+
+        if not _LucamTakeFastFrame(self._handle, frame_cdata):
             raise LucamError(self)
         return frame
 
-    def convert_frame_to_rgb(self, frame: np.ndarray) -> np.ndarray:
+    def take_fast_frame_into(self, out: np.ndarray) -> np.ndarray:
+        """
+        Capture a raw frame directly into `out`.
+
+        `out` must be a writable C-contiguous uint8 array of shape (height, width). It
+        can be backed by pinned (page-locked) memory so the frame can be copied to a
+        GPU without an intermediate staging copy.
+        """
+        if (
+            out.shape != (self.height, self.width)
+            or out.dtype != np.uint8
+            or not out.flags.c_contiguous
+            or not out.flags.writeable
+        ):
+            raise ValueError(
+                "Output buffer must be a writable C-contiguous uint8 array with shape "
+                f"{(self.height, self.width)}, got {out.dtype} with shape {out.shape}."
+            )
+
+        if not _LucamTakeFastFrame(self._handle, self.ffi.from_buffer(out)):
+            raise LucamError(self)
+        return out
+
+    def _rgb_output(
+        self, frame: np.ndarray, out: np.ndarray | None, planar: bool = False
+    ) -> np.ndarray:
+        """
+        Validate `out` or fall back to the reused RGB buffer for `frame`.
+
+        Planar buffers have shape (3, height, width), interleaved ones
+        (height, width, 3).
+        """
+        if self.bayer_offset is None:
+            raise ValueError("Monochrome frames can't be converted to RGB.")
+
+        shape = (3, *frame.shape) if planar else (*frame.shape, 3)
+        if out is None:
+            buffer_name = "_planar_rgb_buf" if planar else "_rgb_buf"
+            buffer = getattr(self, buffer_name)
+            if buffer is None or buffer.shape != shape:
+                buffer = np.empty(shape, dtype=np.uint8)
+                setattr(self, buffer_name, buffer)
+            return buffer
+
+        if out.shape != shape or out.dtype != np.uint8 or not out.flags.c_contiguous:
+            raise ValueError(
+                f"Output buffer must be a C-contiguous uint8 array with shape {shape}, "
+                f"got {out.dtype} with shape {out.shape}."
+            )
+        return out
+
+    def convert_frame_to_rgb(
+        self, frame: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
         """
         Use opencv to demosaic the Bayer filtered frame.
 
+        If `out` is given, the RGB frame is written into it. It must be a C-contiguous
+        uint8 array of shape (height, width, 3). Otherwise it's written into a buffer
+        owned by the camera which is overwritten by the next conversion, so `.copy()`
+        the result to keep it.
+
         I couldn't get the api `ConvertFrameToRgb24` to work.
         """
-        return cvtColor(frame, self.color_conversion_code)
+        out = self._rgb_output(frame, out)
+        cvtColor(frame, self.color_conversion_code, dst=out)
+        return out
 
-    def take_fast_frame_rgb(self) -> np.ndarray:
-        return self.convert_frame_to_rgb(self.take_fast_frame())
+    def take_fast_frame_rgb(self, out: np.ndarray | None = None) -> np.ndarray:
+        return self.convert_frame_to_rgb(self.take_fast_frame(copy=False), out)
+
+    def take_fast_frames_rgb(self, count: int):
+        """
+        Capture `count` frames and yield them demosaiced.
+
+        A background thread captures the next frame while the current one is being
+        demosaiced; neither the DLL call nor `cvtColor` holds the GIL. The
+        yielded frame is the buffer from `convert_frame_to_rgb`, so it's only valid
+        until the following one is requested; copy it to keep it.
+        """
+        filled = Queue()
+        free = Queue()
+        for _ in range(2):
+            free.put(np.empty((self.height, self.width), dtype=np.uint8))
+        stop = Event()
+
+        def capture():
+            try:
+                for _ in range(count):
+                    frame = free.get()
+                    if stop.is_set():
+                        return
+                    filled.put(self.take_fast_frame_into(frame))
+            except BaseException as error:
+                # forward anything, or the consumer would wait on `filled` forever
+                filled.put(error)
+
+        thread = Thread(target=capture, daemon=True)
+        thread.start()
+        try:
+            for _ in range(count):
+                frame = filled.get()
+                if isinstance(frame, BaseException):
+                    raise frame
+                rgb = self.convert_frame_to_rgb(frame)
+                free.put(frame)
+                yield rgb
+        finally:
+            # wake the capture thread if it's waiting for a buffer
+            stop.set()
+            free.put(None)
+            thread.join()
+
+    def convert_frame_to_planar_rgb(
+        self, frame: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Demosaic the Bayer filtered frame into a (3, height, width) array.
+
+        Each channel is contiguous, which suits per-channel processing (statistics,
+        gains, ML inputs) better than interleaved RGB. opencv only writes interleaved
+        output, so this uses a Numba bilinear kernel that matches `cvtColor` except on
+        the border pixels. `out` is handled as in `convert_frame_to_rgb`.
+        """
+        out = self._rgb_output(frame, out, planar=True)
+        if frame.shape == (self.height, self.width):
+            # specialized to the camera's frame shape, compiled once per format
+            demosaic = make_demosaic(*frame.shape, *self.bayer_offset)
+            demosaic(frame, out[0], out[1], out[2])
+        else:
+            demosaic_bilinear(frame, out[0], out[1], out[2], *self.bayer_offset)
+        return out
+
+    def take_fast_frame_planar_rgb(self, out: np.ndarray | None = None) -> np.ndarray:
+        return self.convert_frame_to_planar_rgb(self.take_fast_frame(copy=False), out)
+
+    def convert_frame_to_rgb_balanced(
+        self,
+        frame: np.ndarray,
+        gain_red: float = 1.0,
+        gain_green1: float = 1.0,
+        gain_green2: float = 1.0,
+        gain_blue: float = 1.0,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Demosaic the Bayer filtered frame with digital per-channel gains.
+
+        The gains scale the Bayer sites through lookup tables before the frame is
+        demosaiced as in `convert_frame_to_rgb`, so samples clip at 255 before
+        they're interpolated. `gain_green1` is for green pixels on red rows and
+        `gain_green2` for those on blue rows. The frame must be C-contiguous with an
+        even width. The output buffer behaves as in `convert_frame_to_rgb`.
+        """
+        out = self._rgb_output(frame, out)
+        if self._gained_buf is None or self._gained_buf.shape != frame.shape:
+            self._gained_buf = np.empty(frame.shape, dtype=np.uint8)
+
+        luts = bayer_gain_luts(
+            (gain_red, gain_green1, gain_green2, gain_blue), *self.bayer_offset
+        )
+        apply_bayer_gains(frame.view(np.uint16), self._gained_buf.view(np.uint16), luts)
+        cvtColor(self._gained_buf, self.color_conversion_code, dst=out)
+        return out
+
+    def take_fast_frame_rgb_balanced(
+        self,
+        gain_red: float = 1.0,
+        gain_green1: float = 1.0,
+        gain_green2: float = 1.0,
+        gain_blue: float = 1.0,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Capture a frame and demosaic it with digital per-channel gains.
+
+        The gains are applied in software on top of the snapshot gains the camera
+        already applies, see `convert_frame_to_rgb_balanced`.
+        """
+        return self.convert_frame_to_rgb_balanced(
+            self.take_fast_frame(copy=False),
+            gain_red,
+            gain_green1,
+            gain_green2,
+            gain_blue,
+            out,
+        )
+
+    def _init_cuda(self, height: int, width: int) -> None:
+        """Create the CUDA stream and device buffers for frames of the given shape."""
+        if self.color_conversion_code is None:
+            raise ValueError("Monochrome frames can't be converted to RGB.")
+        if cuda.getCudaEnabledDeviceCount() == 0:
+            raise RuntimeError("OpenCV wasn't built with CUDA or no CUDA device found.")
+
+        self._cuda_stream = cuda_Stream()
+        self._gpu_in = cuda_GpuMat(height, width, CV_8UC1)
+        self._gpu_out = cuda_GpuMat(height, width, CV_8UC3)
+
+    def _enqueue_demosaic_cuda(self, frame: np.ndarray, out: np.ndarray) -> None:
+        """Queue the upload, demosaic, and download of `frame` on the CUDA stream."""
+        if self._cuda_stream is None or self._gpu_in.size() != frame.shape[::-1]:
+            self._init_cuda(*frame.shape)
+
+        self._gpu_in.upload(frame, self._cuda_stream)
+        cuda.demosaicing(
+            self._gpu_in,
+            self.color_conversion_code,
+            dst=self._gpu_out,
+            stream=self._cuda_stream,
+        )
+        self._gpu_out.download(self._cuda_stream, out)
+
+    def convert_frame_to_rgb_cuda(
+        self, frame: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Demosaic the Bayer filtered frame on the GPU with OpenCV's CUDA module."""
+        if out is None:
+            out = np.empty((*frame.shape, 3), dtype=np.uint8)
+        self._enqueue_demosaic_cuda(frame, out)
+        self._cuda_stream.waitForCompletion()
+        return out
+
+    def take_fast_frames_rgb_cuda(self, count: int):
+        """
+        Capture `count` frames and yield them demosaiced on the GPU.
+
+        Each frame is captured while the previous one is being demosaiced. Two sets
+        of buffers are alternated, so a yielded frame is only valid until the
+        following one is requested; copy it to keep it.
+        """
+        shape = (self.height, self.width)
+        frames = [np.empty(shape, dtype=np.uint8) for _ in range(2)]
+        outs = [np.empty((*shape, 3), dtype=np.uint8) for _ in range(2)]
+        self._init_cuda(*shape)
+        # transfers from pageable memory are synchronous, so pin the buffers in place
+        # for the upload and download to run alongside the capture
+        buffers = frames + outs
+        for buffer in buffers:
+            cuda.registerPageLocked(buffer)
+
+        try:
+            pending = None
+            for i in range(count):
+                frame = self.take_fast_frame_into(frames[i % 2])
+                if pending is not None:
+                    self._cuda_stream.waitForCompletion()
+                    yield pending
+                self._enqueue_demosaic_cuda(frame, outs[i % 2])
+                pending = outs[i % 2]
+
+            if pending is not None:
+                self._cuda_stream.waitForCompletion()
+                yield pending
+        finally:
+            self._cuda_stream.waitForCompletion()
+            for buffer in buffers:
+                cuda.unregisterPageLocked(buffer)
+
+    def take_fast_frame_gray(self) -> np.ndarray:
+        """
+        Capture a frame and convert it to grayscale.
+
+        This writes a third of the bytes of `take_fast_frame_rgb`, so prefer it when
+        only the intensity is needed (focusing, exposure, thumbnails).
+        """
+        if self.gray_conversion_code is None:
+            return self.take_fast_frame()
+        return cvtColor(self.take_fast_frame(copy=False), self.gray_conversion_code)
 
     def white_balance(
         self,
@@ -241,8 +676,8 @@ class LucamCamera:
         width = self.width if width is None else width
         height = self.height if height is None else height
 
-        snapshot = self.snapshot.as_lucam()
-        frame = self.take_fast_frame()
+        snapshot = self.snapshot.as_lucam(self._scratch_snapshot)
+        frame = self.take_fast_frame(copy=False)
         if not self.lib.LucamAdjustWhiteBalanceFromSnapshot(
             self._handle,
             snapshot,
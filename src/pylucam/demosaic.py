@@ -0,0 +1,144 @@
+from functools import cache, lru_cache
+
+import numpy as np
+from numba import njit, prange
+
+__all__ = [
+    "apply_bayer_gains",
+    "bayer_gain_luts",
+    "demosaic_bilinear",
+    "make_demosaic",
+]
+
+
+@njit(inline="always")
+def _demosaic_pixel(bayer, i, j, up, down, left, right, red_row, red_col):
+    """Interpolate the (red, green, blue) value of a single pixel."""
+    center = np.int32(bayer[i, j])
+    if red_row == red_col:
+        cross = (
+            np.int32(bayer[up, j])
+            + np.int32(bayer[down, j])
+            + np.int32(bayer[i, left])
+            + np.int32(bayer[i, right])
+            + 2
+        ) >> 2
+        diagonal = (
+            np.int32(bayer[up, left])
+            + np.int32(bayer[up, right])
+            + np.int32(bayer[down, left])
+            + np.int32(bayer[down, right])
+            + 2
+        ) >> 2
+        if red_row:
+            return center, cross, diagonal
+        return diagonal, cross, center
+
+    horizontal = (np.int32(bayer[i, left]) + np.int32(bayer[i, right]) + 1) >> 1
+    vertical = (np.int32(bayer[up, j]) + np.int32(bayer[down, j]) + 1) >> 1
+    if red_row:
+        return horizontal, center, vertical
+    return vertical, center, horizontal
+
+
+@njit(inline="always")
+def _neighbours(index, last, offset):
+    """
+    Return the indices before and after `index` along an axis ending at `last`, and
+    whether `index` is on a red row/column of the RGGB mosaic shifted by `offset`.
+    Borders are mirrored about the edge pixel so the missing neighbours keep the
+    right color.
+    """
+    before = index - 1 if index > 0 else 1
+    after = index + 1 if index < last else last - 1
+    return before, after, (index + offset) & 1 == 0
+
+
+@njit(inline="always")
+def _demosaic(bayer, out_r, out_g, out_b, height, width, row_offset, col_offset):
+    """Loop shared by the generic and the shape specialized kernels."""
+    for i in prange(height):
+        up, down, red_row = _neighbours(i, height - 1, row_offset)
+        for j in range(width):
+            left, right, red_col = _neighbours(j, width - 1, col_offset)
+            red, green, blue = _demosaic_pixel(
+                bayer, i, j, up, down, left, right, red_row, red_col
+            )
+            out_r[i, j] = red
+            out_g[i, j] = green
+            out_b[i, j] = blue
+
+
+@njit(parallel=True, boundscheck=False, fastmath=True, nogil=True, cache=True)
+def demosaic_bilinear(bayer, out_r, out_g, out_b, row_offset, col_offset):
+    """
+    Bilinear demosaic of a Bayer frame into separate red, green, and blue planes.
+
+    The kernel is written for an RGGB mosaic. Other patterns are the same mosaic
+    shifted by one row and/or column, which is given by `row_offset`/`col_offset`.
+    Takes any frame shape; `make_demosaic` builds a faster one for a fixed shape.
+    """
+    height, width = bayer.shape
+    _demosaic(bayer, out_r, out_g, out_b, height, width, row_offset, col_offset)
+
+
+@cache
+def make_demosaic(height: int, width: int, row_offset: int, col_offset: int):
+    """
+    Build `demosaic_bilinear` specialized to a fixed frame shape and Bayer pattern.
+
+    The shape and offsets are closed over as constants, so Numba folds them into
+    the loop bounds and border checks. The closure's constants are part of Numba's
+    cache key, so each specialization is cached on disk like the other kernels. The
+    returned kernel takes `(bayer, out_r, out_g, out_b)` and must only be called
+    with frames of the given shape.
+    """
+
+    @njit(parallel=True, boundscheck=False, fastmath=True, nogil=True, cache=True)
+    def demosaic(bayer, out_r, out_g, out_b):
+        _demosaic(bayer, out_r, out_g, out_b, height, width, row_offset, col_offset)
+
+    return demosaic
+
+
+@lru_cache(maxsize=16)
+def bayer_gain_luts(
+    gains: tuple[float, float, float, float], row_offset: int, col_offset: int
+) -> np.ndarray:
+    """
+    Build the lookup tables used by `apply_bayer_gains`.
+
+    `gains` is (red, green on red rows, green on blue rows, blue) and the Bayer
+    pattern is given by `row_offset`/`col_offset` as in `demosaic_bilinear`. Two
+    horizontally adjacent pixels read as one uint16 index a table for their row
+    parity, so each lookup scales both sites at once. The tables are cached, so they
+    must not be modified.
+    """
+    site_luts = np.clip(np.arange(256) * np.array(gains)[:, None] + 0.5, 0, 255)
+    site_luts = site_luts.astype(np.uint8)
+    # the bytes of each uint16 index in memory order, i.e. the pair of pixels
+    pairs = np.arange(1 << 16, dtype=np.uint16).view(np.uint8).reshape(-1, 2)
+
+    luts = np.empty((2, 1 << 16, 2), dtype=np.uint8)
+    for row in range(2):
+        red_row = (row + row_offset) & 1 == 0
+        for col in range(2):
+            red_col = (col + col_offset) & 1 == 0
+            site = (0 if red_row else 2) + (0 if red_col else 1)
+            luts[row, :, col] = site_luts[site][pairs[:, col]]
+    return luts.view(np.uint16).reshape(2, -1)
+
+
+@njit(parallel=True, boundscheck=False, fastmath=True, nogil=True, cache=True)
+def apply_bayer_gains(pairs, out, luts):
+    """
+    Scale each site of a Bayer frame by its gain, clipping at 255.
+
+    `pairs` and `out` are the input and output frames viewed as uint16, so the frame
+    width must be even, and `luts` comes from `bayer_gain_luts`.
+    """
+    height, width = pairs.shape
+    for i in prange(height):
+        lut = luts[i & 1]
+        for j in range(width):
+            out[i, j] = lut[pairs[i, j]]
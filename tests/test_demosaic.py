@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from cv2 import (
+    cvtColor,
+    COLOR_BAYER_RGGB2RGB,
+    COLOR_BAYER_GRBG2RGB,
+    COLOR_BAYER_GBRG2RGB,
+    COLOR_BAYER_BGGR2RGB,
+)
+
+from pylucam.demosaic import (
+    apply_bayer_gains,
+    bayer_gain_luts,
+    demosaic_bilinear,
+    make_demosaic,
+)
+
+# (row, column) shift of each Bayer pattern relative to RGGB, as in `BAYER_OFFSETS`
+PATTERNS = {
+    (0, 0): COLOR_BAYER_RGGB2RGB,
+    (0, 1): COLOR_BAYER_GRBG2RGB,
+    (1, 0): COLOR_BAYER_GBRG2RGB,
+    (1, 1): COLOR_BAYER_BGGR2RGB,
+}
+
+
+def random_bayer(height: int, width: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (height, width), dtype=np.uint8)
+
+
+def specialized(bayer, out_r, out_g, out_b, row_offset, col_offset):
+    demosaic = make_demosaic(*bayer.shape, row_offset, col_offset)
+    demosaic(bayer, out_r, out_g, out_b)
+
+
+@pytest.mark.parametrize("demosaic", [demosaic_bilinear, specialized])
+@pytest.mark.parametrize("shape", [(16, 20), (17, 23)])
+@pytest.mark.parametrize("offset", PATTERNS)
+def test_demosaic_matches_opencv(demosaic, shape, offset):
+    bayer = random_bayer(*shape)
+    out = np.empty((*shape, 3), dtype=np.uint8)
+    demosaic(bayer, out[..., 0], out[..., 1], out[..., 2], *offset)
+
+    # the borders are mirrored rather than handled like opencv, so only the interior
+    # is compared
+    expected = cvtColor(bayer, PATTERNS[offset])
+    np.testing.assert_array_equal(out[1:-1, 1:-1], expected[1:-1, 1:-1])
+
+
+@pytest.mark.parametrize("offset", PATTERNS)
+def test_apply_bayer_gains(offset):
+    bayer = random_bayer(16, 20)
+    gains = (1.5, 0.75, 1.25, 2.0)
+    out = np.empty_like(bayer)
+    apply_bayer_gains(
+        bayer.view(np.uint16), out.view(np.uint16), bayer_gain_luts(gains, *offset)
+    )
+
+    # gain of each site of the RGGB mosaic shifted by `offset`
+    row_offset, col_offset = offset
+    site_gains = np.array([gains[:2], gains[2:]])
+    rows = (np.arange(16)[:, None] + row_offset) & 1
+    cols = (np.arange(20)[None, :] + col_offset) & 1
+    expected = np.minimum(bayer * site_gains[rows, cols] + 0.5, 255).astype(np.uint8)
+    np.testing.assert_array_equal(out, expected)